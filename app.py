@@ -21,6 +21,8 @@ from streamlit_extras.stylable_container import stylable_container
 import warnings
 warnings.filterwarnings("ignore")
 import xgboost as xgb
+from model_store import current_model_path, shadow_model_paths
+from shadow import ModelRegistry
 
 # Custom CSS for professional styling
 st.markdown("""
@@ -292,12 +294,13 @@ st.markdown("""
     </style>
     """, unsafe_allow_html=True)
 
-# Load model (with error handling)
-@st.cache_resource
-def load_model(model_path):
+# Load the primary and shadow candidate models (with error handling). Cached
+# per set of paths and shared across sessions, so publishing a new version
+# through retrain.py is picked up on the next rerun without a restart.
+@st.cache_resource(max_entries=2)
+def load_registry(model_path, candidate_paths):
     try:
-        model = joblib.load(model_path)
-        return model
+        return ModelRegistry(model_path, candidate_paths)
     except Exception as e:
         st.error(f"Error loading model: {e}")
         return None
@@ -377,8 +380,8 @@ def main():
     st.markdown("---")
 
     # Load model
-    model = load_model("personality_model.joblib")
-    if model is None:
+    registry = load_registry(current_model_path(), shadow_model_paths())
+    if registry is None:
         st.error("Model could not be loaded. Please check the model file.")
         return
 
@@ -496,8 +499,8 @@ def main():
                     time.sleep(0.02)
                     progress_bar.progress(percent_complete + 1, text="Processing your responses")
                 time.sleep(0.1)
-                prediction = model.predict(input_data)[0]
-                proba = model.predict_proba(input_data)[0]
+                # Shadow candidates are scored in the background, never in this request
+                prediction, proba = registry.predict(input_data)
                 # For 1=Introvert and 0=Extrovert
                 introvert_prob = proba[1]
                 extrovert_prob = proba[0]
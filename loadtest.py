@@ -0,0 +1,276 @@
+"""Load test the Streamlit app with concurrent simulated sessions.
+
+Starts `streamlit run app.py` (or targets a running server with --url) and
+drives it with headless websocket clients speaking Streamlit's own
+protocol. Each simulated user opens a session, waits for the page to
+render, fills personality_form with random answers and submits it. For
+every concurrency level the tool reports throughput, submit latency
+percentiles and the server's resident memory per concurrent session, so
+capacity can be planned per pod.
+
+    python loadtest.py --levels 1,2,4,8,16 --sessions-per-worker 3
+
+Server RSS is read from /proc, so memory figures are only reported on Linux.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+
+from streamlit.proto.Alert_pb2 import Alert
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.proto.WidgetStates_pb2 import WidgetState
+from tornado.websocket import websocket_connect
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+APP_PATH = os.path.join(APP_DIR, "app.py")
+# Matches the server's default server.maxMessageSize (200 MB)
+MAX_MESSAGE_SIZE = 200 * 2**20
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--levels", default="1,2,4,8,16",
+                        help="Comma-separated concurrency levels to test")
+    parser.add_argument("--sessions-per-worker", type=int, default=3,
+                        help="Sessions each concurrent user runs back to back")
+    parser.add_argument("--url", default=None,
+                        help="Base URL of an already running server (default: start one)")
+    parser.add_argument("--pid", type=int, default=None,
+                        help="Server process id for RSS sampling when using --url")
+    parser.add_argument("--port", type=int, default=None,
+                        help="Port for the server this tool starts (default: a free port)")
+    parser.add_argument("--timeout", type=float, default=60,
+                        help="Seconds allowed for a single script run")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", dest="json_path",
+                        help="Also write the results to this JSON file")
+    return parser.parse_args()
+
+
+def rss_mb(pid):
+    """Resident set size of ``pid`` in MB, or None when it cannot be read."""
+    try:
+        with open(f"/proc/{pid}/statm") as f:
+            pages = int(f.read().split()[1])
+    except (OSError, TypeError):
+        return None
+    return pages * os.sysconf("SC_PAGE_SIZE") / 2**20
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(port, timeout=60):
+    """Launch `streamlit run app.py` headless and wait until it is healthy."""
+    process = subprocess.Popen(
+        [sys.executable, "-m", "streamlit", "run", APP_PATH,
+         "--server.headless", "true",
+         "--server.port", str(port),
+         "--server.fileWatcherType", "none",
+         "--browser.gatherUsageStats", "false"],
+        cwd=APP_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"streamlit exited with code {process.returncode}")
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/_stcore/health", timeout=1):
+                return process
+        except OSError:
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError("streamlit server did not become healthy in time")
+
+
+async def send_rerun(ws, widget_states=()):
+    msg = BackMsg()
+    msg.rerun_script.query_string = ""
+    msg.rerun_script.page_script_hash = ""
+    msg.rerun_script.widget_states.widgets.extend(widget_states)
+    await ws.write_message(msg.SerializeToString(), binary=True)
+
+
+async def read_script_run(ws, timeout):
+    """Consume ForwardMsgs until the script run finishes.
+
+    Returns the widgets rendered during the run, grouped by element type,
+    and the first exception or st.error message shown, if any.
+    """
+    widgets = {"slider": [], "selectbox": [], "button": []}
+    error = None
+    deadline = time.monotonic() + timeout
+    while True:
+        payload = await asyncio.wait_for(ws.read_message(), deadline - time.monotonic())
+        if payload is None:
+            raise ConnectionError("server closed the websocket")
+        msg = ForwardMsg()
+        msg.ParseFromString(payload)
+        kind = msg.WhichOneof("type")
+        if kind == "script_finished":
+            return widgets, error
+        if kind != "delta" or msg.delta.WhichOneof("type") != "new_element":
+            continue
+        element = msg.delta.new_element
+        element_type = element.WhichOneof("type")
+        if element_type in widgets:
+            widgets[element_type].append(getattr(element, element_type))
+        elif element_type == "exception" and error is None:
+            error = element.exception.message
+        elif element_type == "alert" and element.alert.format == Alert.ERROR and error is None:
+            error = element.alert.body
+
+
+def random_answers(widgets, rng):
+    """Widget states for a personality_form submission with random answers."""
+    states = []
+    for slider in widgets["slider"]:
+        state = WidgetState(id=slider.id)
+        state.double_array_value.data.append(rng.randint(int(slider.min), int(slider.max)))
+        states.append(state)
+    for selectbox in widgets["selectbox"]:
+        states.append(WidgetState(id=selectbox.id, int_value=rng.randrange(len(selectbox.options))))
+    submit = next(b for b in widgets["button"] if b.is_form_submitter)
+    states.append(WidgetState(id=submit.id, trigger_value=True))
+    return states
+
+
+async def run_session(ws_url, rng, timeout):
+    """Load the page, submit random answers and return (load_s, submit_s, error)."""
+    load_time = submit_time = None
+    try:
+        ws = await websocket_connect(ws_url, max_message_size=MAX_MESSAGE_SIZE)
+    except Exception as e:
+        return load_time, submit_time, f"connect failed: {e!r}"
+    try:
+        start = time.perf_counter()
+        await send_rerun(ws)
+        widgets, error = await read_script_run(ws, timeout)
+        load_time = time.perf_counter() - start
+        if error:
+            return load_time, submit_time, error
+
+        start = time.perf_counter()
+        await send_rerun(ws, random_answers(widgets, rng))
+        _, error = await read_script_run(ws, timeout)
+        submit_time = time.perf_counter() - start
+        return load_time, submit_time, error
+    except Exception as e:
+        return load_time, submit_time, repr(e)
+    finally:
+        ws.close()
+
+
+async def sample_rss(pid, samples, interval=0.05):
+    while True:
+        samples.append(rss_mb(pid))
+        await asyncio.sleep(interval)
+
+
+def percentile(values, q):
+    if not values:
+        return float("nan")
+    values = sorted(values)
+    index = min(len(values) - 1, max(0, round(q / 100 * len(values)) - 1))
+    return values[index]
+
+
+async def run_level(ws_url, pid, concurrency, sessions_per_worker, timeout, seed):
+    async def worker(index):
+        rng = random.Random(seed * 1000 + index)
+        return [await run_session(ws_url, rng, timeout) for _ in range(sessions_per_worker)]
+
+    idle_rss = rss_mb(pid)
+    rss_samples = []
+    sampler = asyncio.create_task(sample_rss(pid, rss_samples))
+    start = time.perf_counter()
+    per_worker = await asyncio.gather(*(worker(i) for i in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    sampler.cancel()
+
+    results = [r for worker_results in per_worker for r in worker_results]
+    load_times = [r[0] for r in results if r[0] is not None]
+    submit_times = [r[1] for r in results if r[1] is not None and r[2] is None]
+    errors = [r[2] for r in results if r[2] is not None]
+    rss_samples = [s for s in rss_samples if s is not None]
+    peak_rss = max(rss_samples) if rss_samples else None
+    return {
+        "concurrency": concurrency,
+        "sessions": len(results),
+        "errors": len(errors),
+        "first_error": errors[0] if errors else None,
+        "elapsed_s": elapsed,
+        "throughput_sessions_per_s": len(submit_times) / elapsed,
+        "load_p50_s": percentile(load_times, 50),
+        "submit_p50_s": percentile(submit_times, 50),
+        "submit_p95_s": percentile(submit_times, 95),
+        "submit_p99_s": percentile(submit_times, 99),
+        "server_rss_mb": peak_rss,
+        "rss_per_session_mb": (peak_rss - idle_rss) / concurrency if peak_rss and idle_rss else None,
+    }
+
+
+def format_mb(value):
+    return f"{value:>8.1f}" if value is not None else f"{'n/a':>8}"
+
+
+async def run(args, base_url, pid):
+    ws_url = base_url.replace("http", "ws", 1).rstrip("/") + "/_stcore/stream"
+    levels = [int(level) for level in args.levels.split(",")]
+
+    # Warm up imports and the cached model so the first level is not penalised
+    print("Warming up...")
+    _, _, error = await run_session(ws_url, random.Random(args.seed), args.timeout)
+    if error:
+        print(f"Warm-up session failed: {error}")
+        return 1
+
+    header = (f"{'conc':>5} {'sessions':>8} {'errors':>6} {'sess/s':>7} {'load p50':>9} "
+              f"{'submit p50':>10} {'p95':>7} {'p99':>7} {'RSS MB':>8} {'MB/sess':>8}")
+    print(header)
+    print("-" * len(header))
+    results = []
+    for concurrency in levels:
+        r = await run_level(ws_url, pid, concurrency, args.sessions_per_worker,
+                            args.timeout, args.seed)
+        results.append(r)
+        print(f"{r['concurrency']:>5} {r['sessions']:>8} {r['errors']:>6} "
+              f"{r['throughput_sessions_per_s']:>7.2f} {r['load_p50_s']:>8.2f}s "
+              f"{r['submit_p50_s']:>9.2f}s {r['submit_p95_s']:>6.2f}s {r['submit_p99_s']:>6.2f}s "
+              f"{format_mb(r['server_rss_mb'])} {format_mb(r['rss_per_session_mb'])}")
+        if r["first_error"]:
+            print(f"      first error: {r['first_error']}")
+
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+def main():
+    args = parse_args()
+    if args.url:
+        return asyncio.run(run(args, args.url, args.pid))
+
+    port = args.port or free_port()
+    print(f"Starting streamlit on port {port}...")
+    server = start_server(port)
+    try:
+        return asyncio.run(run(args, f"http://127.0.0.1:{port}", server.pid))
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,176 @@
+import json
+import os
+import tempfile
+from datetime import datetime
+
+import joblib
+import pandas as pd
+
+# Model the app ships with, used until a retrained version is published
+DEFAULT_MODEL_PATH = "personality_model.joblib"
+MODELS_DIR = "models"
+MANIFEST_PATH = os.path.join(MODELS_DIR, "manifest.json")
+DATASET_PATH = "personality_dataset.csv"
+
+# Rows of personality_dataset.csv the shipped model was built from
+BASELINE_ROWS = 2900
+
+FEATURE_NAMES = [
+    'Time_spent_Alone',
+    'Stage_fear',
+    'Social_event_attendance',
+    'Going_outside',
+    'Drained_after_socializing',
+    'Friends_circle_size',
+    'Post_frequency',
+    'High_Engagement'
+]
+TARGET = 'Personality'
+
+NUMERIC_COLS = ["Time_spent_Alone", "Social_event_attendance", "Going_outside",
+                "Friends_circle_size", "Post_frequency"]
+BINARY_INPUTS = ['Stage_fear', 'Drained_after_socializing']
+# Same encoding LabelEncoder produced in personality.ipynb (alphabetical order)
+BINARY_MAPS = {
+    'Stage_fear': {'No': 0, 'Yes': 1},
+    'Drained_after_socializing': {'No': 0, 'Yes': 1},
+    'Personality': {'Extrovert': 0, 'Introvert': 1},
+}
+
+
+def fit_fill_values(df):
+    """Medians and modes used to fill missing inputs, computed from ``df``.
+
+    Pass only training rows so validation rows do not influence the fill.
+    """
+    values = {col: df[col].median() for col in NUMERIC_COLS}
+    for col in BINARY_INPUTS:
+        values[col] = df[col].map(BINARY_MAPS[col]).mode()[0]
+    return values
+
+
+def prepare_features(df, fill_values):
+    """Encode raw dataset rows for the model.
+
+    Rows without a Personality label are dropped rather than imputed. Missing
+    inputs are filled with ``fill_values`` (see ``fit_fill_values``), a
+    simpler scheme than the RandomForest imputer personality.ipynb used for
+    the Yes/No columns. Returns ``(X, y)`` indexed like ``df``, with the
+    columns in ``FEATURE_NAMES`` order.
+    """
+    df = df.copy()
+    for col, mapping in BINARY_MAPS.items():
+        df[col] = df[col].map(mapping)
+    df = df[df[TARGET].notna()]
+    for col in NUMERIC_COLS:
+        df[col] = df[col].fillna(fill_values[col])
+    for col in BINARY_INPUTS:
+        df[col] = df[col].fillna(fill_values[col]).astype(int)
+    df['High_Engagement'] = (
+        (df['Social_event_attendance'] > 5) &
+        (df['Friends_circle_size'] > 10) &
+        (df['Post_frequency'] > 5)
+    ).astype(int)
+    return df[FEATURE_NAMES], df[TARGET].astype(int)
+
+
+def read_manifest():
+    """Return the published-model manifest, or defaults for the shipped model."""
+    try:
+        with open(MANIFEST_PATH) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {"current": DEFAULT_MODEL_PATH, "rows_seen": BASELINE_ROWS,
+                "shadow": [], "versions": []}
+
+
+def current_model_path():
+    """Path of the model version the app should serve."""
+    return read_manifest()["current"]
+
+
+def shadow_model_paths():
+    """Paths of candidate models scored in shadow next to the current one."""
+    return tuple(read_manifest().get("shadow", []))
+
+
+def _atomic_write(path, write):
+    # Write to a temp file in the target directory, then rename over the
+    # destination so readers never observe a partially written file.
+    directory = os.path.dirname(path) or "."
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            write(f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def publish_model(model, rows_seen, metrics, shadow=False):
+    """Save ``model`` as a new versioned artifact and make it current.
+
+    The artifact is written before the manifest is switched, so a running
+    app keeps serving the previous version until the new one is complete.
+    With ``shadow=True`` the version is added to the shadow candidates
+    instead, leaving the current model in place.
+    """
+    os.makedirs(MODELS_DIR, exist_ok=True)
+    version = datetime.now().strftime("%Y%m%dT%H%M%S%f")
+    model_path = os.path.join(MODELS_DIR, f"personality_model-{version}.joblib")
+    if os.path.exists(model_path):
+        raise FileExistsError(f"model version {version} already exists")
+    _atomic_write(model_path, lambda f: joblib.dump(model, f))
+
+    manifest = read_manifest()
+    manifest["versions"].append({
+        "version": version,
+        "path": model_path,
+        "parent": manifest["current"],
+        "rows_seen": rows_seen,
+        "metrics": metrics,
+    })
+    if shadow:
+        manifest.setdefault("shadow", []).append(model_path)
+    else:
+        manifest["current"] = model_path
+        manifest["rows_seen"] = rows_seen
+        _prune_shadow(manifest)
+    _write_manifest(manifest)
+    return model_path
+
+
+def promote_model(model_path):
+    """Make the shadow candidate ``model_path`` the current model.
+
+    Candidates published before it are dropped from the shadow list, since
+    they would otherwise keep being compared against a newer primary.
+    """
+    model_path = os.path.normpath(model_path)
+    manifest = read_manifest()
+    if model_path not in manifest.get("shadow", []):
+        raise ValueError(f"{model_path} is not a shadow candidate")
+    version = next(v for v in manifest["versions"] if v["path"] == model_path)
+    manifest["current"] = model_path
+    manifest["rows_seen"] = version["rows_seen"]
+    _prune_shadow(manifest)
+    _write_manifest(manifest)
+
+
+def _prune_shadow(manifest):
+    # Keep only candidates published after the current version
+    order = [v["path"] for v in manifest["versions"]]
+    current = order.index(manifest["current"]) if manifest["current"] in order else -1
+    manifest["shadow"] = [path for path in manifest.get("shadow", [])
+                          if path in order and order.index(path) > current]
+
+
+def _write_manifest(manifest):
+    _atomic_write(MANIFEST_PATH, lambda f: f.write(json.dumps(manifest, indent=2).encode()))
+
+
+def load_dataset(path=DATASET_PATH):
+    return pd.read_csv(path)
@@ -0,0 +1,161 @@
+"""Continue training the served model on newly labeled responses.
+
+Rows appended to personality_dataset.csv since the current model was
+published are used to add boosting rounds to the existing XGBoost booster
+instead of rerunning personality.ipynb. The new version is only published
+if its accuracy on a held-out slice does not drop below the current model's.
+
+    python retrain.py --rounds 20 --learning-rate 0.05 --tolerance 0.005 --compare-full
+"""
+import argparse
+import copy
+import sys
+import time
+import zlib
+
+import joblib
+import pandas as pd
+from sklearn.metrics import accuracy_score
+from sklearn.model_selection import train_test_split
+import xgboost as xgb
+from xgboost import XGBClassifier
+
+import model_store
+
+# Share of rows kept out of training to validate every new version
+HOLDOUT_FRACTION = 0.2
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--data", default=model_store.DATASET_PATH,
+                        help="Labeled dataset with new rows appended at the end")
+    parser.add_argument("--since", type=int, default=None,
+                        help="Index of the first new row (default: rows_seen from the manifest)")
+    parser.add_argument("--rounds", type=int, default=20,
+                        help="Boosting rounds to add on top of the current booster")
+    parser.add_argument("--learning-rate", type=float, default=0.05,
+                        help="Learning rate for the added rounds, kept small so a batch "
+                             "of new rows refines the booster rather than overriding it")
+    parser.add_argument("--tolerance", type=float, default=0.005,
+                        help="Largest accuracy drop on the holdout that still publishes")
+    parser.add_argument("--shadow", action="store_true",
+                        help="Publish as a shadow candidate instead of replacing the current model")
+    parser.add_argument("--promote", metavar="PATH",
+                        help="Make a shadow candidate the current model and exit")
+    parser.add_argument("--compare-full", action="store_true",
+                        help="Also time a full retrain from scratch and report the speedup")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="Train and validate but do not publish")
+    return parser.parse_args()
+
+
+def holdout_mask(n_rows):
+    """Rows reserved for validation, never trained on by any version.
+
+    The shipped model's rows keep the notebook's train/test split; appended
+    rows are assigned by a hash of their position, so the assignment never
+    changes as more rows arrive.
+    """
+    mask = pd.Series(False, index=range(n_rows))
+    _, baseline_test = train_test_split(
+        range(model_store.BASELINE_ROWS), test_size=HOLDOUT_FRACTION, random_state=42)
+    mask[[i for i in baseline_test if i < n_rows]] = True
+    for i in range(model_store.BASELINE_ROWS, n_rows):
+        mask[i] = zlib.crc32(str(i).encode()) % 100 < HOLDOUT_FRACTION * 100
+    return mask
+
+
+def main():
+    args = parse_args()
+    if args.promote:
+        try:
+            model_store.promote_model(args.promote)
+        except ValueError as e:
+            print(e)
+            return 1
+        print(f"Promoted {args.promote} to the current model")
+        return 0
+
+    manifest = model_store.read_manifest()
+    base_path = manifest["current"]
+    rows_seen = manifest["rows_seen"] if args.since is None else args.since
+
+    df = model_store.load_dataset(args.data)
+    if len(df) <= rows_seen:
+        print(f"No new labeled rows since row {rows_seen}; nothing to do.")
+        return 0
+    holdout = holdout_mask(len(df))
+    fill_values = model_store.fit_fill_values(df[~holdout])
+    X, y = model_store.prepare_features(df, fill_values)
+    holdout = holdout[X.index]
+    new = pd.Series(X.index >= rows_seen, index=X.index)
+    print(f"Base model: {base_path}")
+    print(f"New labeled rows: {new.sum()} (rows {rows_seen}..{len(df) - 1})")
+    X_test, y_test = X[holdout], y[holdout]
+    X_new_train, y_new_train = X[new & ~holdout], y[new & ~holdout]
+    X_new_test, y_new_test = X[new & holdout], y[new & holdout]
+    if X_new_train.empty:
+        print("No new labeled training rows outside the holdout; nothing to do.")
+        return 0
+
+    base_model = joblib.load(base_path)
+    params = base_model.get_params()
+    params.pop("use_label_encoder", None)
+
+    # Warm start: add rounds to the existing booster using only the new rows.
+    # The native API is used because XGBClassifier.fit rejects a batch whose
+    # labels are all one class, which is normal for a few new responses.
+    start = time.perf_counter()
+    booster_params = {k: v for k, v in base_model.get_xgb_params().items() if v is not None}
+    booster = xgb.train({**booster_params, "learning_rate": args.learning_rate},
+                        xgb.DMatrix(X_new_train, y_new_train), args.rounds,
+                        xgb_model=base_model.get_booster())
+    # Reuse the base classifier's fitted attributes (classes, feature names)
+    candidate = copy.deepcopy(base_model)
+    candidate._Booster = booster
+    incremental_time = time.perf_counter() - start
+
+    metrics = {
+        "base_accuracy": accuracy_score(y_test, base_model.predict(X_test)),
+        "candidate_accuracy": accuracy_score(y_test, candidate.predict(X_test)),
+        # None when no new row falls in the holdout
+        "candidate_new_rows_accuracy": (accuracy_score(y_new_test, candidate.predict(X_new_test))
+                                        if len(y_new_test) > 0 else None),
+        "incremental_seconds": incremental_time,
+    }
+    if args.compare_full:
+        # Full retrain from scratch on every training row, for comparison only
+        start = time.perf_counter()
+        full_model = XGBClassifier(**params)
+        full_model.fit(X[~holdout], y[~holdout])
+        metrics["full_retrain_seconds"] = time.perf_counter() - start
+        metrics["full_retrain_accuracy"] = accuracy_score(y_test, full_model.predict(X_test))
+
+    print(f"\nHoldout rows: {len(X_test)} ({len(X_test) - len(X_new_test)} old, {len(X_new_test)} new)")
+    print(f"Base model accuracy:        {metrics['base_accuracy']:.4f}")
+    new_rows_accuracy = metrics["candidate_new_rows_accuracy"]
+    print(f"Incremental model accuracy: {metrics['candidate_accuracy']:.4f}"
+          f" (new rows only: {'n/a' if new_rows_accuracy is None else f'{new_rows_accuracy:.4f}'})")
+    if args.compare_full:
+        print(f"Full retrain accuracy:      {metrics['full_retrain_accuracy']:.4f}")
+    print(f"\nIncremental training: {incremental_time:.3f}s")
+    if args.compare_full:
+        full_time = metrics["full_retrain_seconds"]
+        print(f"Full retrain:         {full_time:.3f}s")
+        print(f"Speedup:              {full_time / incremental_time:.1f}x")
+
+    if metrics["candidate_accuracy"] < metrics["base_accuracy"] - args.tolerance:
+        print("\nHoldout accuracy dropped beyond tolerance; keeping the current model.")
+        return 1
+    if args.dry_run:
+        print("\nDry run; not publishing.")
+        return 0
+
+    model_path = model_store.publish_model(candidate, len(df), metrics, shadow=args.shadow)
+    print(f"\nPublished {model_path}{' as a shadow candidate' if args.shadow else ''}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
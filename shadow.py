@@ -0,0 +1,126 @@
+"""Multi-model registry with asynchronous shadow scoring.
+
+The primary model answers the user. Candidate models score the same
+feature vectors on a background thread fed by a bounded queue; when the
+queue is full the work is dropped, so shadow scoring never adds latency
+to the request that produced it. Agreement, probability deltas and
+per-model latency are written to the ``shadow`` logger.
+"""
+import logging
+import queue
+import threading
+import time
+
+import joblib
+
+logger = logging.getLogger("shadow")
+logger.setLevel(logging.INFO)
+if not logger.handlers:
+    _handler = logging.StreamHandler()
+    _handler.setFormatter(logging.Formatter("%(asctime)s %(name)s %(message)s"))
+    logger.addHandler(_handler)
+
+
+def _score(model, input_data):
+    """Return (prediction, class probabilities, latency in ms) for the first row."""
+    start = time.perf_counter()
+    prediction = model.predict(input_data)[0]
+    proba = model.predict_proba(input_data)[0]
+    return prediction, proba, (time.perf_counter() - start) * 1000
+
+
+# One worker and queue for the whole process. Registries replaced in the
+# st.cache_resource cache then leave nothing running that holds their models.
+QUEUE_SIZE = 64
+_queue = queue.Queue(maxsize=QUEUE_SIZE)
+_worker = None
+_worker_lock = threading.Lock()
+
+
+def _run_worker():
+    while True:
+        evaluator, job = _queue.get()
+        try:
+            evaluator._evaluate(*job)
+        except Exception:
+            logger.exception("shadow scoring failed")
+        finally:
+            # Drop references so an evicted registry's models can be freed
+            del evaluator, job
+            _queue.task_done()
+
+
+def _ensure_worker():
+    global _worker
+    with _worker_lock:
+        if _worker is None:
+            _worker = threading.Thread(target=_run_worker, name="shadow-scorer", daemon=True)
+            _worker.start()
+
+
+class ShadowEvaluator:
+    """Score candidate models on the shared worker and log the comparison."""
+
+    def __init__(self, candidates):
+        self.candidates = candidates
+        self.dropped = 0
+        self.stats = {path: {"scored": 0, "agreed": 0, "abs_delta": 0.0, "latency_ms": 0.0}
+                      for path in candidates}
+        self._lock = threading.Lock()
+        _ensure_worker()
+
+    def submit(self, input_data, prediction, proba, latency_ms):
+        """Queue a primary result for shadow scoring without ever blocking."""
+        try:
+            _queue.put_nowait((self, (input_data, prediction, proba, latency_ms)))
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+
+    def _evaluate(self, input_data, prediction, proba, latency_ms):
+        for path, model in self.candidates.items():
+            shadow_prediction, shadow_proba, shadow_latency_ms = _score(model, input_data)
+            agreed = shadow_prediction == prediction
+            delta = shadow_proba[1] - proba[1]
+            with self._lock:
+                stats = self.stats[path]
+                stats["scored"] += 1
+                stats["agreed"] += int(agreed)
+                stats["abs_delta"] += abs(delta)
+                stats["latency_ms"] += shadow_latency_ms
+                agreement_rate = stats["agreed"] / stats["scored"]
+                mean_abs_delta = stats["abs_delta"] / stats["scored"]
+                dropped = self.dropped
+            logger.info(
+                "candidate=%s agree=%s proba_delta=%+.4f primary_ms=%.2f candidate_ms=%.2f "
+                "agreement_rate=%.3f mean_abs_delta=%.4f scored=%d dropped=%d",
+                path, agreed, delta, latency_ms, shadow_latency_ms,
+                agreement_rate, mean_abs_delta, stats["scored"], dropped)
+
+
+class ModelRegistry:
+    """Model versions loaded once and shared across sessions."""
+
+    def __init__(self, primary_path, candidate_paths=()):
+        self.primary_path = primary_path
+        self.primary = joblib.load(primary_path)
+        candidates = {}
+        for path in candidate_paths:
+            if path == primary_path:
+                continue
+            try:
+                candidates[path] = joblib.load(path)
+            except Exception:
+                # A broken candidate must never take the primary down with it
+                logger.exception("could not load shadow candidate %s", path)
+        self.shadow = ShadowEvaluator(candidates) if candidates else None
+
+    def predict(self, input_data):
+        """Score ``input_data`` with the primary model and queue shadow scoring.
+
+        Returns the primary ``(prediction, proba)`` for the first row.
+        """
+        prediction, proba, latency_ms = _score(self.primary, input_data)
+        if self.shadow is not None:
+            self.shadow.submit(input_data, prediction, proba, latency_ms)
+        return prediction, proba